@@ -50,7 +50,7 @@ CREATE TABLE IF NOT EXISTS scan_templates (
     ports VARCHAR(500),
     rate INTEGER,
     configuration JSONB,
-    is_default BOOLEAN DEFAULT false,
+    is_default BOOLEAN NOT NULL DEFAULT false,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT valid_scanner CHECK (scanner IN ('nmap', 'masscan', 'dns'))
@@ -66,12 +66,14 @@ CREATE TABLE IF NOT EXISTS scan_logs (
 );
 
 -- Indexes for better performance
-CREATE INDEX idx_scans_status ON scans(status);
-CREATE INDEX idx_scans_scanner ON scans(scanner);
+-- Composite (filter, created_at DESC) indexes let the scan list's
+-- "WHERE ... ORDER BY created_at DESC LIMIT n" read rows in order without a sort
+CREATE INDEX idx_scans_status_created_at ON scans(status, created_at DESC);
+CREATE INDEX idx_scans_scanner_created_at ON scans(scanner, created_at DESC);
 CREATE INDEX idx_scans_created_at ON scans(created_at DESC);
-CREATE INDEX idx_scan_results_scan_id ON scan_results(scan_id);
+CREATE INDEX idx_scan_results_scan_id_state ON scan_results(scan_id, state);
 CREATE INDEX idx_scan_results_host ON scan_results(host);
-CREATE INDEX idx_scan_logs_scan_id ON scan_logs(scan_id);
+CREATE INDEX idx_scan_logs_scan_id_created_at ON scan_logs(scan_id, created_at);
 CREATE INDEX idx_scan_templates_scanner ON scan_templates(scanner);
 
 -- Insert default scan templates
@@ -176,7 +178,7 @@ CREATE TABLE IF NOT EXISTS vulnerability_templates (
     nuclei_templates TEXT[],
     severity_filter TEXT[],
     configuration JSONB,
-    is_default BOOLEAN DEFAULT false,
+    is_default BOOLEAN NOT NULL DEFAULT false,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
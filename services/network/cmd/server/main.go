@@ -1,8 +1,14 @@
 package main
 
 import (
+	"context"
 	"log"
+	"os"
+	"os/signal"
+	"syscall"
+	"time"
 
+	"github.com/goccy/go-json"
 	"github.com/gofiber/fiber/v2"
 	"github.com/gofiber/fiber/v2/middleware/recover"
 	"github.com/nmap-scanner/backend-go/internal/api/handlers"
@@ -20,6 +26,7 @@ func main() {
 	log.Printf("Database: %s", cfg.DatabaseURL)
 	log.Printf("Redis: %s", cfg.RedisURL)
 	log.Printf("Use System Nmap: %v", cfg.UseSystemNmap)
+	log.Printf("Max Concurrent Scans: %d", cfg.MaxConcurrentScans)
 	log.Printf("Environment: %s", cfg.Environment)
 
 	// Initialize database
@@ -36,15 +43,23 @@ func main() {
 
 	log.Printf("Initialized scanners: Nmap (%s), Masscan (%s), DNS", cfg.NmapPath, cfg.MasscanPath)
 
+	// Cancelled on SIGINT/SIGTERM; scans run under it so shutdown stops them
+	ctx, stop := signal.NotifyContext(context.Background(), os.Interrupt, syscall.SIGTERM)
+	defer stop()
+
 	// Initialize handlers
-	scanHandler := handlers.NewScanHandler(db, nmapScanner, masscanScanner, dnsScanner)
+	scanHandler := handlers.NewScanHandler(ctx, db, nmapScanner, masscanScanner, dnsScanner, cfg.MaxConcurrentScans)
 	templateHandler := handlers.NewTemplateHandler(db)
 	reportHandler := handlers.NewReportHandler(db)
 
 	// Create Fiber app
+	// goccy/go-json is a drop-in replacement for encoding/json that avoids most of
+	// the reflection cost on large result/port lists
 	app := fiber.New(fiber.Config{
 		AppName:      "Security Scanner - Network Service",
 		ServerHeader: "Network-Service",
+		JSONEncoder:  json.Marshal,
+		JSONDecoder:  json.Unmarshal,
 	})
 
 	// Middleware
@@ -88,15 +103,31 @@ func main() {
 	// Vulnerability templates route (for Nmap scan type selection)
 	api.Get("/vulnerability-templates", templateHandler.ListVulnerabilityTemplates)
 
-	// Report routes
-	reports := api.Group("/reports")
+	// Report routes (compressed, reports are large and highly repetitive)
+	reports := api.Group("/reports", middleware.Compress())
 	reports.Get("/:id/json", reportHandler.GetJSONReport)
 	reports.Get("/:id/html", reportHandler.GetHTMLReport)
 	reports.Get("/:id/csv", reportHandler.GetCSVReport)
 
 	// Start server
-	log.Printf("Server listening on port %s", cfg.Port)
-	if err := app.Listen(":" + cfg.Port); err != nil {
-		log.Fatalf("Failed to start server: %v", err)
+	go func() {
+		log.Printf("Server listening on port %s", cfg.Port)
+		if err := app.Listen(":" + cfg.Port); err != nil {
+			log.Fatalf("Failed to start server: %v", err)
+		}
+	}()
+
+	// Graceful shutdown: the signal cancels every running scan, then we stop
+	// accepting requests and give the scanners a bounded time to record the
+	// cancellation before the database pool is closed
+	<-ctx.Done()
+
+	log.Println("Shutting down server...")
+	if err := app.Shutdown(); err != nil {
+		log.Printf("Server shutdown error: %v", err)
+	}
+	log.Println("Waiting for running scans to stop...")
+	if !scanHandler.Wait(10 * time.Second) {
+		log.Println("Timed out waiting for running scans")
 	}
 }
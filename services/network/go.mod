@@ -3,6 +3,7 @@ module github.com/nmap-scanner/backend-go
 go 1.21
 
 require (
+	github.com/goccy/go-json v0.10.2
 	github.com/gofiber/fiber/v2 v2.52.0
 	github.com/jackc/pgx/v5 v5.5.1
 	github.com/redis/go-redis/v9 v9.4.0
@@ -1,17 +1,20 @@
 package handlers
 
 import (
-	"bytes"
+	"bufio"
 	"context"
 	"encoding/csv"
-	"encoding/json"
 	"fmt"
 	"html/template"
+	"log"
+	"strconv"
 	"strings"
 	"time"
 
+	"github.com/goccy/go-json"
 	"github.com/gofiber/fiber/v2"
 	"github.com/google/uuid"
+	"github.com/jackc/pgx/v5"
 	"github.com/nmap-scanner/backend-go/internal/database"
 	"github.com/nmap-scanner/backend-go/internal/models"
 )
@@ -24,74 +27,150 @@ func NewReportHandler(db *database.Database) *ReportHandler {
 	return &ReportHandler{db: db}
 }
 
-// ScanReport represents a complete scan report
-type ScanReport struct {
-	Scan    models.Scan       `json:"scan"`
-	Results []models.ScanResult `json:"results"`
-	Logs    []models.ScanLog    `json:"logs"`
+// reportSummary holds the HTML report totals, computed by the database
+type reportSummary struct {
+	TotalHosts      int
+	TotalDNSRecords int
 }
 
-// GetJSONReport returns scan results in JSON format
+// GetJSONReport streams scan results in JSON format.
+// Results and logs are encoded row by row straight from the database cursor,
+// so memory stays bounded regardless of how many hosts the scan found.
 func (h *ReportHandler) GetJSONReport(c *fiber.Ctx) error {
 	scanID := c.Params("id")
 
-	report, err := h.getScanReport(scanID)
+	batch := &pgx.Batch{}
+	batch.Queue(reportScanQuery, scanID)
+	batch.Queue(reportResultsQuery, scanID)
+	batch.Queue(reportLogsQuery, scanID)
+	br := h.db.Pool.SendBatch(context.Background(), batch)
+
+	scan, err := scanScanRow(br.QueryRow())
 	if err != nil {
+		br.Close()
 		return c.Status(404).JSON(fiber.Map{"error": "Scan not found"})
 	}
 
 	c.Set("Content-Disposition", fmt.Sprintf("attachment; filename=scan_%s.json", scanID))
 	c.Set("Content-Type", "application/json")
 
-	return c.JSON(report)
+	// The stream writer owns the batch from here on and always runs, so it is
+	// the one to release the connection
+	c.Context().SetBodyStreamWriter(func(w *bufio.Writer) {
+		defer br.Close()
+		if err := streamJSONReport(w, scan, br); err != nil {
+			log.Printf("Failed to stream JSON report for scan %s: %v", scan.ID, err)
+		}
+	})
+
+	return nil
 }
 
-// GetHTMLReport returns scan results as an HTML report
+// GetHTMLReport streams scan results as an HTML report, rendering one host
+// card at a time as results arrive from the database
 func (h *ReportHandler) GetHTMLReport(c *fiber.Ctx) error {
 	scanID := c.Params("id")
 
-	report, err := h.getScanReport(scanID)
+	batch := &pgx.Batch{}
+	batch.Queue(reportScanQuery, scanID)
+	batch.Queue(reportSummaryQuery, scanID)
+	batch.Queue(reportHostsQuery, scanID)
+	br := h.db.Pool.SendBatch(context.Background(), batch)
+
+	scan, err := scanScanRow(br.QueryRow())
 	if err != nil {
+		br.Close()
 		return c.Status(404).JSON(fiber.Map{"error": "Scan not found"})
 	}
 
-	htmlContent := h.generateHTMLReport(report)
+	// Read the totals before the response is committed so a database error is
+	// still reported as a 500 rather than as a report of an empty scan
+	summary, err := scanSummaryRow(br.QueryRow())
+	if err != nil {
+		br.Close()
+		return c.Status(500).JSON(fiber.Map{"error": "Failed to generate report"})
+	}
 
 	c.Set("Content-Disposition", fmt.Sprintf("attachment; filename=scan_%s.html", scanID))
 	c.Set("Content-Type", "text/html")
 
-	return c.SendString(htmlContent)
+	c.Context().SetBodyStreamWriter(func(w *bufio.Writer) {
+		defer br.Close()
+		if err := streamHTMLReport(w, scan, summary, br); err != nil {
+			log.Printf("Failed to stream HTML report for scan %s: %v", scan.ID, err)
+		}
+	})
+
+	return nil
 }
 
-// GetCSVReport returns scan results as a CSV file
+// GetCSVReport streams scan results as a CSV file
 func (h *ReportHandler) GetCSVReport(c *fiber.Ctx) error {
 	scanID := c.Params("id")
 
-	report, err := h.getScanReport(scanID)
+	batch := &pgx.Batch{}
+	batch.Queue(reportScanQuery, scanID)
+	batch.Queue(reportHostsQuery, scanID)
+	br := h.db.Pool.SendBatch(context.Background(), batch)
+
+	scan, err := scanScanRow(br.QueryRow())
 	if err != nil {
+		br.Close()
 		return c.Status(404).JSON(fiber.Map{"error": "Scan not found"})
 	}
 
-	csvContent := h.generateCSVReport(report)
-
 	c.Set("Content-Disposition", fmt.Sprintf("attachment; filename=scan_%s.csv", scanID))
 	c.Set("Content-Type", "text/csv")
 
-	return c.SendString(csvContent)
-}
+	// The stream writer runs after the handler returns, when c (and the path
+	// buffer behind c.Params) may already serve another request, so it only
+	// uses values it owns
+	c.Context().SetBodyStreamWriter(func(w *bufio.Writer) {
+		defer br.Close()
+		if err := streamCSVReport(w, br); err != nil {
+			log.Printf("Failed to stream CSV report for scan %s: %v", scan.ID, err)
+		}
+	})
 
-// getScanReport retrieves a complete scan report from database
-func (h *ReportHandler) getScanReport(scanID string) (*ScanReport, error) {
-	ctx := context.Background()
+	return nil
+}
 
-	// Get scan
-	scanQuery := `
+// Report queries. Each handler queues the scan lookup together with the
+// queries its report needs in one pgx.Batch, so a report costs a single
+// round-trip to the database instead of one per query.
+const (
+	reportScanQuery = `
 		SELECT id, name, target, scan_type, scanner, status, progress, created_at, started_at, completed_at, error_message
 		FROM scans WHERE id = $1
 	`
+	// Counts hosts and DNS records (services) without transferring the JSONB
+	reportSummaryQuery = `
+		SELECT COUNT(*),
+		       COALESCE(SUM(CASE WHEN jsonb_typeof(services) = 'array' THEN jsonb_array_length(services) ELSE 0 END), 0)
+		FROM scan_results WHERE scan_id = $1
+	`
+	reportResultsQuery = `
+		SELECT id, scan_id, host, hostname, state, ports, os_detection, services, mac_address, mac_vendor, created_at
+		FROM scan_results WHERE scan_id = $1
+	`
+	// Lighter projection for the HTML and CSV views: they never render
+	// os_detection (which holds the full DNS record set for DNS scans), so the
+	// blob is not transferred or decoded for them
+	reportHostsQuery = `
+		SELECT host, hostname, state, ports, services, mac_address, mac_vendor
+		FROM scan_results WHERE scan_id = $1
+	`
+	reportLogsQuery = `
+		SELECT id, scan_id, level, message, created_at
+		FROM scan_logs WHERE scan_id = $1 ORDER BY created_at ASC
+	`
+)
+
+// scanScanRow scans the result of reportScanQuery
+func scanScanRow(row pgx.Row) (*models.Scan, error) {
 	var scan models.Scan
 	var scanner *string
-	err := h.db.Pool.QueryRow(ctx, scanQuery, scanID).Scan(
+	err := row.Scan(
 		&scan.ID, &scan.Name, &scan.Target, &scan.ScanType, &scanner, &scan.Status,
 		&scan.Progress, &scan.CreatedAt, &scan.StartedAt, &scan.CompletedAt, &scan.ErrorMessage,
 	)
@@ -101,72 +180,129 @@ func (h *ReportHandler) getScanReport(scanID string) (*ScanReport, error) {
 	// Default scanner based on scan_type if null
 	if scanner != nil {
 		scan.Scanner = *scanner
-	} else if strings.HasPrefix(strings.ToLower(scan.ScanType), "masscan") {
-		scan.Scanner = "masscan"
-	} else if strings.HasPrefix(strings.ToLower(scan.ScanType), "dns") {
-		scan.Scanner = "dns"
 	} else {
-		scan.Scanner = "nmap"
+		scan.Scanner = determineScannerType(scan.ScanType)
 	}
 
-	// Get results
-	resultsQuery := `
-		SELECT id, scan_id, host, hostname, state, ports, os_detection, services, mac_address, mac_vendor, created_at
-		FROM scan_results WHERE scan_id = $1
-	`
-	rows, err := h.db.Pool.Query(ctx, resultsQuery, scanID)
-	if err != nil {
-		return nil, err
+	return &scan, nil
+}
+
+// scanSummaryRow scans the result of reportSummaryQuery
+func scanSummaryRow(row pgx.Row) (reportSummary, error) {
+	var summary reportSummary
+	err := row.Scan(&summary.TotalHosts, &summary.TotalDNSRecords)
+	return summary, err
+}
+
+// scanResultRow scans the current row of a reportResultsQuery cursor
+func scanResultRow(rows pgx.Rows) (models.ScanResult, error) {
+	var result models.ScanResult
+	err := rows.Scan(&result.ID, &result.ScanID, &result.Host, &result.Hostname, &result.State,
+		&result.Ports, &result.OSDetection, &result.Services, &result.MacAddress, &result.MacVendor, &result.CreatedAt)
+	return result, err
+}
+
+// scanHostRow scans the current row of a reportHostsQuery cursor
+func scanHostRow(rows pgx.Rows) (models.ScanResult, error) {
+	var result models.ScanResult
+	err := rows.Scan(&result.Host, &result.Hostname, &result.State,
+		&result.Ports, &result.Services, &result.MacAddress, &result.MacVendor)
+	return result, err
+}
+
+// scanLogRow scans the current row of a reportLogsQuery cursor
+func scanLogRow(rows pgx.Rows) (models.ScanLog, error) {
+	var scanLog models.ScanLog
+	err := rows.Scan(&scanLog.ID, &scanLog.ScanID, &scanLog.Level, &scanLog.Message, &scanLog.CreatedAt)
+	return scanLog, err
+}
+
+// streamJSONReport writes a {scan, results, logs} JSON document to w,
+// encoding results and logs one row at a time as they are read from br.
+// If a query fails mid-stream the document is left truncated, so the client
+// sees invalid JSON instead of a report that silently lacks rows.
+func streamJSONReport(w *bufio.Writer, scan *models.Scan, br pgx.BatchResults) error {
+	defer w.Flush()
+
+	// A single encoder writes straight into the response buffer, so rows are
+	// never marshalled into an intermediate []byte and copied again
+	enc := json.NewEncoder(w)
+	enc.SetEscapeHTML(false)
+
+	w.WriteString(`{"scan":`)
+	if err := enc.Encode(scan); err != nil {
+		return err
+	}
+
+	// Send the header early so the client sees progress before the first row
+	w.WriteString(`,"results":[`)
+	if err := w.Flush(); err != nil {
+		return err
 	}
-	defer rows.Close()
 
-	results := []models.ScanResult{}
+	rows, err := br.Query()
+	if err != nil {
+		return err
+	}
+	first := true
 	for rows.Next() {
-		var result models.ScanResult
-		err := rows.Scan(&result.ID, &result.ScanID, &result.Host, &result.Hostname, &result.State,
-			&result.Ports, &result.OSDetection, &result.Services, &result.MacAddress, &result.MacVendor, &result.CreatedAt)
+		result, err := scanResultRow(rows)
 		if err != nil {
 			continue
 		}
-		results = append(results, result)
+		if err := writeJSONElement(w, enc, result, &first); err != nil {
+			rows.Close()
+			return err
+		}
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return err
 	}
 
-	// Get logs
-	logsQuery := `
-		SELECT id, scan_id, level, message, created_at
-		FROM scan_logs WHERE scan_id = $1 ORDER BY created_at ASC
-	`
-	logRows, err := h.db.Pool.Query(ctx, logsQuery, scanID)
+	w.WriteString(`],"logs":[`)
+
+	logRows, err := br.Query()
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer logRows.Close()
-
-	logs := []models.ScanLog{}
+	first = true
 	for logRows.Next() {
-		var log models.ScanLog
-		err := logRows.Scan(&log.ID, &log.ScanID, &log.Level, &log.Message, &log.CreatedAt)
+		scanLog, err := scanLogRow(logRows)
 		if err != nil {
 			continue
 		}
-		logs = append(logs, log)
+		if err := writeJSONElement(w, enc, scanLog, &first); err != nil {
+			return err
+		}
+	}
+	if err := logRows.Err(); err != nil {
+		return err
 	}
 
-	return &ScanReport{
-		Scan:    scan,
-		Results: results,
-		Logs:    logs,
-	}, nil
+	_, err = w.WriteString(`]}`)
+	return err
 }
 
-// generateHTMLReport creates an HTML report from scan data
-func (h *ReportHandler) generateHTMLReport(report *ScanReport) string {
-	const htmlTemplate = `<!DOCTYPE html>
+// writeJSONElement encodes v as the next element of a JSON array
+func writeJSONElement(w *bufio.Writer, enc *json.Encoder, v interface{}, first *bool) error {
+	if !*first {
+		w.WriteByte(',')
+	}
+	*first = false
+	return enc.Encode(v)
+}
+
+// htmlReportHead is the static start of every HTML report (doctype, meta tags
+// and stylesheet). It holds no per-scan data, so it is written to the response
+// as-is instead of going through the template; "report-start" picks up from
+// the <title> tag.
+const htmlReportHead = `<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Security Scanner Report - {{.Scan.Name}}</title>
     <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
         body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; max-width: 1200px; margin: 0 auto; padding: 20px; }
@@ -197,6 +333,14 @@ func (h *ReportHandler) generateHTMLReport(report *ScanReport) string {
         .service-item:last-child { border-bottom: none; }
         .footer { text-align: center; color: #6b7280; font-size: 14px; margin-top: 30px; padding: 20px; border-top: 1px solid #e5e7eb; }
     </style>
+`
+
+// htmlTemplate is the HTML report layout; it is parsed once into reportTemplate.
+// The report is streamed: "report-start" renders the header and summary, then
+// "host" (or "dns-host" for DNS scans) runs once per result row, and
+// "report-end" closes the document. "port-row" is kept on a single line since
+// it runs once per port.
+const htmlTemplate = `{{define "report-start"}}    <title>Security Scanner Report - {{.Scan.Name}}</title>
 </head>
 <body>
     <div class="header">
@@ -212,42 +356,40 @@ func (h *ReportHandler) generateHTMLReport(report *ScanReport) string {
     <div class="section">
         <div class="section-header">📊 Summary</div>
         <div class="section-body">
-            <p><strong>Total Hosts Found:</strong> {{len .Results}}</p>
-            {{if .IsDNSScan}}<p><strong>Total DNS Records:</strong> {{.TotalDNSRecords}}</p>{{end}}
+            <p><strong>Total Hosts Found:</strong> {{.Summary.TotalHosts}}</p>
+            {{if .IsDNSScan}}<p><strong>Total DNS Records:</strong> {{.Summary.TotalDNSRecords}}</p>{{end}}
             <p><strong>Scan Duration:</strong> {{if .Scan.CompletedAt}}{{.Duration}}{{else}}In Progress{{end}}</p>
         </div>
     </div>
 
-    {{if .IsDNSScan}}
     <div class="section">
-        <div class="section-header">🌐 DNS Records</div>
+        {{if .IsDNSScan}}<div class="section-header">🌐 DNS Records</div>{{else}}<div class="section-header">🖥️ Discovered Hosts ({{.Summary.TotalHosts}})</div>{{end}}
         <div class="section-body">
-            {{range .Results}}
+{{end}}
+{{- define "report-end"}}
+            {{if and (not .IsDNSScan) (eq .Summary.TotalHosts 0)}}<p>No hosts discovered</p>{{end}}
+        </div>
+    </div>
+
+    <div class="footer">
+        <p>Generated by Security Scanner on {{.GeneratedAt}}</p>
+    </div>
+</body>
+</html>
+{{end}}
+{{- define "dns-host"}}
             <div class="host-card">
                 <div class="host-header">
                     <span><strong>{{.Host}}</strong></span>
                     <span class="badge badge-{{.State}}">{{.State}}</span>
                 </div>
                 <div class="host-body">
-                    {{if .Services}}
-                    {{range .Services}}
-                    <div class="dns-record">
-                        <span class="dns-value">{{.}}</span>
-                    </div>
-                    {{end}}
-                    {{else}}
-                    <p>No DNS records found</p>
-                    {{end}}
+                    {{range .Services}}<div class="dns-record"><span class="dns-value">{{.}}</span></div>
+                    {{else}}<p>No DNS records found</p>{{end}}
                 </div>
             </div>
-            {{end}}
-        </div>
-    </div>
-    {{else}}
-    <div class="section">
-        <div class="section-header">🖥️ Discovered Hosts ({{len .Results}})</div>
-        <div class="section-body">
-            {{range .Results}}
+{{end}}
+{{- define "host"}}
             <div class="host-card">
                 <div class="host-header">
                     <span><strong>{{.Host}}</strong>{{if .Hostname}} ({{.Hostname}}){{end}}</span>
@@ -258,31 +400,16 @@ func (h *ReportHandler) generateHTMLReport(report *ScanReport) string {
                     {{if .Ports}}
                     <table class="ports-table">
                         <thead>
-                            <tr>
-                                <th>Port</th>
-                                <th>Protocol</th>
-                                <th>State</th>
-                                <th>Service</th>
-                                <th>Version</th>
-                            </tr>
+                            <tr><th>Port</th><th>Protocol</th><th>State</th><th>Service</th><th>Version</th></tr>
                         </thead>
                         <tbody>
-                            {{range .Ports}}
-                            <tr>
-                                <td>{{.Port}}</td>
-                                <td>{{.Protocol}}</td>
-                                <td class="port-{{.State}}">{{.State}}</td>
-                                <td>{{.Service}}</td>
-                                <td>{{.Product}} {{.Version}}</td>
-                            </tr>
-                            {{end}}
+                            {{range .Ports}}{{template "port-row" .}}{{end}}
                         </tbody>
                     </table>
                     {{else if .Services}}
                     <div style="margin-top: 10px;">
                         <strong>Services/Records:</strong>
-                        {{range .Services}}
-                        <div class="service-item">{{.}}</div>
+                        {{range .Services}}<div class="service-item">{{.}}</div>
                         {{end}}
                     </div>
                     {{else}}
@@ -290,75 +417,110 @@ func (h *ReportHandler) generateHTMLReport(report *ScanReport) string {
                     {{end}}
                 </div>
             </div>
-            {{else}}
-            <p>No hosts discovered</p>
-            {{end}}
-        </div>
-    </div>
-    {{end}}
-
-    <div class="footer">
-        <p>Generated by Security Scanner on {{.GeneratedAt}}</p>
-    </div>
-</body>
-</html>`
+{{end}}
+{{- define "port-row"}}<tr><td>{{.Port}}</td><td>{{.Protocol}}</td><td class="port-{{.State}}">{{.State}}</td><td>{{.Service}}</td><td>{{.Product}} {{.Version}}</td></tr>
+{{end}}`
+
+// reportTemplate is compiled at startup and reused by every HTML report request
+var reportTemplate = template.Must(template.New("report").Parse(htmlTemplate))
+
+// htmlReportData is the data passed to the report-start and report-end templates
+type htmlReportData struct {
+	Scan        *models.Scan
+	Summary     reportSummary
+	Duration    string
+	GeneratedAt string
+	IsDNSScan   bool
+}
 
+// newHTMLReportData prepares the header/footer data of an HTML report
+func newHTMLReportData(scan *models.Scan, summary reportSummary) *htmlReportData {
 	// Calculate duration
 	var duration string
-	if report.Scan.CompletedAt != nil && report.Scan.StartedAt != nil {
-		d := report.Scan.CompletedAt.Sub(*report.Scan.StartedAt)
+	if scan.CompletedAt != nil && scan.StartedAt != nil {
+		d := scan.CompletedAt.Sub(*scan.StartedAt)
 		duration = d.String()
 	} else {
 		duration = "N/A"
 	}
 
-	// Check if this is a DNS scan
-	isDNSScan := strings.HasPrefix(report.Scan.ScanType, "dns")
+	return &htmlReportData{
+		Scan:        scan,
+		Summary:     summary,
+		Duration:    duration,
+		GeneratedAt: time.Now().Format("2006-01-02 15:04:05"),
+		// Check if this is a DNS scan
+		IsDNSScan: strings.HasPrefix(scan.ScanType, "dns"),
+	}
+}
 
-	// Count total DNS records
-	totalDNSRecords := 0
-	for _, result := range report.Results {
-		totalDNSRecords += len(result.Services)
+// streamHTMLReport writes an HTML report to w, rendering one host card per
+// result row read from br so only a single row is held in memory at a time.
+// If the hosts query fails the document is left unterminated rather than
+// closed as if the scan had no more hosts.
+func streamHTMLReport(w *bufio.Writer, scan *models.Scan, summary reportSummary, br pgx.BatchResults) error {
+	defer w.Flush()
+
+	data := newHTMLReportData(scan, summary)
+
+	if _, err := w.WriteString(htmlReportHead); err != nil {
+		return err
+	}
+	if err := reportTemplate.ExecuteTemplate(w, "report-start", data); err != nil {
+		return err
 	}
 
-	data := struct {
-		Scan            models.Scan
-		Results         []models.ScanResult
-		Duration        string
-		GeneratedAt     string
-		IsDNSScan       bool
-		TotalDNSRecords int
-	}{
-		Scan:            report.Scan,
-		Results:         report.Results,
-		Duration:        duration,
-		GeneratedAt:     time.Now().Format("2006-01-02 15:04:05"),
-		IsDNSScan:       isDNSScan,
-		TotalDNSRecords: totalDNSRecords,
+	hostTemplate := "host"
+	if data.IsDNSScan {
+		hostTemplate = "dns-host"
 	}
 
-	tmpl, err := template.New("report").Parse(htmlTemplate)
+	rows, err := br.Query()
 	if err != nil {
-		return fmt.Sprintf("<html><body>Error generating report: %v</body></html>", err)
+		return err
 	}
-
-	var buf bytes.Buffer
-	if err := tmpl.Execute(&buf, data); err != nil {
-		return fmt.Sprintf("<html><body>Error generating report: %v</body></html>", err)
+	for rows.Next() {
+		result, err := scanHostRow(rows)
+		if err != nil {
+			continue
+		}
+		if err := reportTemplate.ExecuteTemplate(w, hostTemplate, &result); err != nil {
+			rows.Close()
+			return err
+		}
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return err
 	}
 
-	return buf.String()
+	return reportTemplate.ExecuteTemplate(w, "report-end", data)
 }
 
-// generateCSVReport creates a CSV report from scan data
-func (h *ReportHandler) generateCSVReport(report *ScanReport) string {
-	var buf bytes.Buffer
-	writer := csv.NewWriter(&buf)
+// streamCSVReport writes a CSV report to w, one host row at a time as results
+// are read from br
+func streamCSVReport(w *bufio.Writer, br pgx.BatchResults) error {
+	writer := csv.NewWriter(w)
+	defer w.Flush()
+
+	// Read the hosts result before writing anything so a failure yields an
+	// empty body rather than a header-only file that looks like a scan without
+	// hosts
+	rows, err := br.Query()
+	if err != nil {
+		return err
+	}
+	defer rows.Close()
 
 	// Write header
 	writer.Write([]string{"Host", "Hostname", "State", "MAC Address", "MAC Vendor", "Port", "Protocol", "Port State", "Service", "Product", "Version"})
 
-	for _, result := range report.Results {
+	for rows.Next() {
+		result, err := scanHostRow(rows)
+		if err != nil {
+			continue
+		}
+
 		hostname := ""
 		if result.Hostname != nil {
 			hostname = *result.Hostname
@@ -384,7 +546,7 @@ func (h *ReportHandler) generateCSVReport(report *ScanReport) string {
 					result.State,
 					macAddress,
 					macVendor,
-					fmt.Sprintf("%d", port.Port),
+					strconv.Itoa(port.Port),
 					port.Protocol,
 					port.State,
 					port.Service,
@@ -393,13 +555,21 @@ func (h *ReportHandler) generateCSVReport(report *ScanReport) string {
 				})
 			}
 		}
+
+		// Stop at the first failed write (e.g. the client went away) rather
+		// than reading and formatting the remaining rows
+		writer.Flush()
+		if err := writer.Error(); err != nil {
+			return err
+		}
 	}
 
 	writer.Flush()
-	return buf.String()
+	if err := rows.Err(); err != nil {
+		return err
+	}
+	return writer.Error()
 }
 
 // Ensure uuid is used (for type compatibility)
 var _ = uuid.UUID{}
-// Ensure json is used
-var _ = json.Marshal
@@ -3,13 +3,16 @@ package handlers
 import (
 	"context"
 	"fmt"
+	"log"
 	"net/url"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 
 	"github.com/gofiber/fiber/v2"
 	"github.com/google/uuid"
+	"github.com/jackc/pgx/v5"
 	"github.com/nmap-scanner/backend-go/internal/database"
 	"github.com/nmap-scanner/backend-go/internal/models"
 	"github.com/nmap-scanner/backend-go/internal/scanner"
@@ -20,14 +23,26 @@ type ScanHandler struct {
 	nmapScanner    *scanner.Scanner
 	masscanScanner *scanner.MasscanScanner
 	dnsScanner     *scanner.DNSScanner
+	allTemplates   map[string]interface{}
+	scanTypes      map[string]struct{}
+	running        sync.WaitGroup
+	scanSlots      chan struct{}
+	// scanCtx is the parent context of every scan; it is cancelled when the
+	// service shuts down so running scans stop and record their outcome
+	scanCtx context.Context
 }
 
-func NewScanHandler(db *database.Database, nmapScanner *scanner.Scanner, masscanScanner *scanner.MasscanScanner, dnsScanner *scanner.DNSScanner) *ScanHandler {
+func NewScanHandler(ctx context.Context, db *database.Database, nmapScanner *scanner.Scanner, masscanScanner *scanner.MasscanScanner, dnsScanner *scanner.DNSScanner, maxConcurrentScans int) *ScanHandler {
+	allTemplates := buildAllTemplates(nmapScanner, masscanScanner, dnsScanner)
 	return &ScanHandler{
 		db:             db,
 		nmapScanner:    nmapScanner,
 		masscanScanner: masscanScanner,
 		dnsScanner:     dnsScanner,
+		allTemplates:   allTemplates,
+		scanTypes:      buildScanTypes(allTemplates),
+		scanSlots:      make(chan struct{}, maxConcurrentScans),
+		scanCtx:        ctx,
 	}
 }
 
@@ -73,6 +88,12 @@ func (h *ScanHandler) CreateScan(c *fiber.Ctx) error {
 		return c.Status(400).JSON(fiber.Map{"error": "name, target, and scan_type are required"})
 	}
 
+	// Reject unknown scan types before touching the database; custom nmap
+	// arguments may still be run under any scan_type label
+	if _, ok := h.scanTypes[req.ScanType]; !ok && req.NmapArguments == nil {
+		return c.Status(400).JSON(fiber.Map{"error": fmt.Sprintf("Unknown scan_type: %s", req.ScanType)})
+	}
+
 	// Clean the target (extract hostname from URL if needed)
 	req.Target = cleanTarget(req.Target)
 
@@ -97,14 +118,56 @@ func (h *ScanHandler) CreateScan(c *fiber.Ctx) error {
 	}
 
 	// Route to appropriate scanner based on scan type
-	go h.executeScan(scanID, req)
+	h.running.Add(1)
+	go h.executeScan(h.scanCtx, scanID, req)
 
 	return c.Status(201).JSON(scan)
 }
 
 // executeScan routes the scan to the appropriate scanner
-func (h *ScanHandler) executeScan(scanID uuid.UUID, req models.CreateScanRequest) {
-	ctx := context.Background()
+func (h *ScanHandler) executeScan(ctx context.Context, scanID uuid.UUID, req models.CreateScanRequest) {
+	defer h.running.Done()
+	// A panic in one scan must not take down the service and the other scans;
+	// mark the scan failed so it does not stay running forever
+	defer func() {
+		if r := recover(); r != nil {
+			log.Printf("❌ Scan %s panicked: %v", scanID, r)
+			failQuery := `UPDATE scans SET status = 'failed', error_message = $2, completed_at = NOW() WHERE id = $1`
+			if _, err := h.db.Pool.Exec(context.Background(), failQuery, scanID, fmt.Sprintf("scan panicked: %v", r)); err != nil {
+				log.Printf("Failed to mark panicked scan %s as failed: %v", scanID, err)
+			}
+		}
+	}()
+
+	// Wait for a free slot so only a bounded number of scanner processes run
+	// at once; queued scans stay in the pending state until then. A scan still
+	// queued when the service shuts down is cancelled instead of started.
+	select {
+	case h.scanSlots <- struct{}{}:
+		defer func() { <-h.scanSlots }()
+	case <-ctx.Done():
+		h.cancelPendingScan(scanID)
+		return
+	}
+
+	// select picks at random when a slot frees up as shutdown begins
+	if ctx.Err() != nil {
+		h.cancelPendingScan(scanID)
+		return
+	}
+
+	// The scan may have been cancelled or deleted while it was queued
+	var status string
+	err := h.db.Pool.QueryRow(context.Background(), `SELECT status FROM scans WHERE id = $1`, scanID).Scan(&status)
+	if err != nil {
+		if err != pgx.ErrNoRows {
+			log.Printf("Failed to check status of queued scan %s: %v", scanID, err)
+		}
+		return
+	}
+	if status != "pending" {
+		return
+	}
 
 	// Determine scanner type based on scan_type prefix or name
 	scanType := strings.ToLower(req.ScanType)
@@ -122,6 +185,37 @@ func (h *ScanHandler) executeScan(scanID uuid.UUID, req models.CreateScanRequest
 	default:
 		h.executeNmapScan(ctx, scanID, req)
 	}
+
+	// Shutdown right after the scan left the queue makes the scanner fail
+	// before marking it running; cancel it rather than leave it pending
+	if ctx.Err() != nil {
+		h.cancelPendingScan(scanID)
+	}
+}
+
+// cancelPendingScan cancels a scan that never left the pending state
+func (h *ScanHandler) cancelPendingScan(scanID uuid.UUID) {
+	cancelQuery := `UPDATE scans SET status = 'cancelled', completed_at = NOW() WHERE id = $1 AND status = 'pending'`
+	if _, err := h.db.Pool.Exec(context.Background(), cancelQuery, scanID); err != nil {
+		log.Printf("Failed to cancel queued scan %s: %v", scanID, err)
+	}
+}
+
+// Wait blocks until every scan started by this handler has finished or the
+// timeout expires, and reports whether all scans finished
+func (h *ScanHandler) Wait(timeout time.Duration) bool {
+	done := make(chan struct{})
+	go func() {
+		h.running.Wait()
+		close(done)
+	}()
+
+	select {
+	case <-done:
+		return true
+	case <-time.After(timeout):
+		return false
+	}
 }
 
 // executeNmapScan runs an Nmap scan
@@ -133,6 +227,9 @@ func (h *ScanHandler) executeNmapScan(ctx context.Context, scanID uuid.UUID, req
 		templates := h.nmapScanner.GetScanTemplates()
 		if template, ok := templates[req.ScanType]; ok {
 			nmapArgs = template["arguments"]
+		} else if args, ok := builtinNmapArguments(req.ScanType); ok {
+			// Same table CreateScan validates scan types against
+			nmapArgs = args
 		} else {
 			// Default to quick scan
 			nmapArgs = "-F -T4"
@@ -140,7 +237,7 @@ func (h *ScanHandler) executeNmapScan(ctx context.Context, scanID uuid.UUID, req
 	}
 
 	if err := h.nmapScanner.ExecuteScan(ctx, scanID, req.Target, nmapArgs); err != nil {
-		fmt.Printf("Nmap scan %s failed: %v\n", scanID, err)
+		log.Printf("❌ Nmap scan %s failed: %v", scanID, err)
 	}
 }
 
@@ -176,14 +273,14 @@ func (h *ScanHandler) executeMasscanScan(ctx context.Context, scanID uuid.UUID,
 	}
 
 	if err := h.masscanScanner.ExecuteScan(ctx, scanID, req.Target, ports, rate); err != nil {
-		fmt.Printf("Masscan scan %s failed: %v\n", scanID, err)
+		log.Printf("❌ Masscan scan %s failed: %v", scanID, err)
 	}
 }
 
 // executeDNSScan runs a DNS scan
 func (h *ScanHandler) executeDNSScan(ctx context.Context, scanID uuid.UUID, req models.CreateScanRequest) {
 	if err := h.dnsScanner.ExecuteScan(ctx, scanID, req.Target, req.ScanType); err != nil {
-		fmt.Printf("DNS scan %s failed: %v\n", scanID, err)
+		log.Printf("❌ DNS scan %s failed: %v", scanID, err)
 	}
 }
 
@@ -339,29 +436,26 @@ func (h *ScanHandler) GetScanLogs(c *fiber.Ctx) error {
 // DeleteScan deletes a scan and its related data
 func (h *ScanHandler) DeleteScan(c *fiber.Ctx) error {
 	scanID := c.Params("id")
-
-	// Check if scan exists and get its status and type
-	var status, scanType string
-	checkQuery := `SELECT status, scan_type FROM scans WHERE id = $1`
-	err := h.db.Pool.QueryRow(context.Background(), checkQuery, scanID).Scan(&status, &scanType)
-	if err != nil {
+	if _, err := uuid.Parse(scanID); err != nil {
 		return c.Status(404).JSON(fiber.Map{"error": "Scan not found"})
 	}
 
-	// If scan is running, cancel it first
-	if status == "running" {
-		h.cancelScanByType(scanID, scanType)
-	}
-
-	// Delete scan (cascade will delete results and logs)
-	query := `DELETE FROM scans WHERE id = $1`
-	result, err := h.db.Pool.Exec(context.Background(), query, scanID)
+	// Delete scan in a single statement; results and logs are removed by the
+	// ON DELETE CASCADE foreign keys (indexed on scan_id), and RETURNING gives
+	// us the status needed to stop a scan that was still running
+	var status, scanType string
+	query := `DELETE FROM scans WHERE id = $1 RETURNING status, scan_type`
+	err := h.db.Pool.QueryRow(context.Background(), query, scanID).Scan(&status, &scanType)
 	if err != nil {
+		if err == pgx.ErrNoRows {
+			return c.Status(404).JSON(fiber.Map{"error": "Scan not found"})
+		}
 		return c.Status(500).JSON(fiber.Map{"error": "Failed to delete scan"})
 	}
 
-	if result.RowsAffected() == 0 {
-		return c.Status(404).JSON(fiber.Map{"error": "Scan not found"})
+	// If scan was running, cancel it
+	if status == "running" {
+		h.cancelScanByType(scanID, scanType)
 	}
 
 	return c.JSON(fiber.Map{"message": "Scan deleted successfully"})
@@ -412,10 +506,16 @@ func (h *ScanHandler) cancelScanByType(scanID string, scanType string) {
 
 // GetAllTemplates returns all available scan templates from all scanners
 func (h *ScanHandler) GetAllTemplates(c *fiber.Ctx) error {
+	return c.JSON(h.allTemplates)
+}
+
+// buildAllTemplates merges the templates of every scanner. Scanner templates
+// are static, so this runs once when the handler is created.
+func buildAllTemplates(nmapScanner *scanner.Scanner, masscanScanner *scanner.MasscanScanner, dnsScanner *scanner.DNSScanner) map[string]interface{} {
 	templates := make(map[string]interface{})
 
 	// Nmap templates
-	for key, tmpl := range h.nmapScanner.GetScanTemplates() {
+	for key, tmpl := range nmapScanner.GetScanTemplates() {
 		templates[key] = map[string]interface{}{
 			"name":        tmpl["name"],
 			"description": tmpl["description"],
@@ -425,7 +525,7 @@ func (h *ScanHandler) GetAllTemplates(c *fiber.Ctx) error {
 	}
 
 	// Masscan templates
-	for key, tmpl := range h.masscanScanner.GetTemplates() {
+	for key, tmpl := range masscanScanner.GetTemplates() {
 		templates[key] = map[string]interface{}{
 			"name":        tmpl["name"],
 			"description": tmpl["description"],
@@ -436,7 +536,7 @@ func (h *ScanHandler) GetAllTemplates(c *fiber.Ctx) error {
 	}
 
 	// DNS templates
-	for key, tmpl := range h.dnsScanner.GetTemplates() {
+	for key, tmpl := range dnsScanner.GetTemplates() {
 		templates[key] = map[string]interface{}{
 			"name":        tmpl["name"],
 			"description": tmpl["description"],
@@ -445,5 +545,18 @@ func (h *ScanHandler) GetAllTemplates(c *fiber.Ctx) error {
 		}
 	}
 
-	return c.JSON(templates)
+	return templates
+}
+
+// buildScanTypes returns the set of scan types CreateScan accepts: every
+// scanner template plus the builtin templates offered to the frontend
+func buildScanTypes(allTemplates map[string]interface{}) map[string]struct{} {
+	scanTypes := make(map[string]struct{}, len(allTemplates)+len(builtinTemplates))
+	for key := range allTemplates {
+		scanTypes[key] = struct{}{}
+	}
+	for _, tmpl := range builtinTemplates {
+		scanTypes[tmpl.ScanType] = struct{}{}
+	}
+	return scanTypes
 }
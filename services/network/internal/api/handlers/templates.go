@@ -172,36 +172,47 @@ type BuiltinTemplate struct {
 	Rate        int    `json:"rate,omitempty"`
 }
 
-// ListBuiltinTemplates returns predefined scan templates for all scanners
-func (h *TemplateHandler) ListBuiltinTemplates(c *fiber.Ctx) error {
-	templates := []BuiltinTemplate{
-		// Nmap templates
-		{ScanType: "quick", Name: "Quick Scan", Description: "Fast scan of the most common 100 ports", Arguments: "-F -T4", Scanner: "nmap"},
-		{ScanType: "full", Name: "Full Port Scan", Description: "Comprehensive scan of all 65535 ports", Arguments: "-p- -T4", Scanner: "nmap"},
-		{ScanType: "udp", Name: "UDP Scan", Description: "Scan common UDP ports", Arguments: "-sU --top-ports 100 -T4", Scanner: "nmap"},
-		{ScanType: "discovery", Name: "Host Discovery", Description: "Discover active hosts in network (ping sweep)", Arguments: "-sn -PE -PP -PM --dns-servers 8.8.8.8,1.1.1.1 -T4", Scanner: "nmap"},
-		{ScanType: "local_network", Name: "Local Network Scan", Description: "Complete local network scan with MAC vendor identification", Arguments: "-sn -PR --dns-servers 8.8.8.8,1.1.1.1 -T4", Scanner: "nmap"},
-		{ScanType: "web_server", Name: "Web Server Scan", Description: "Scan web servers (HTTP/HTTPS) with service detection", Arguments: "-p 80,443,8080,8443,3000,5000,8000 -sV --script http-title,http-methods,http-headers -T4", Scanner: "nmap"},
-		{ScanType: "db_server", Name: "Database Server Scan", Description: "Scan common database ports with version detection", Arguments: "-p 3306,5432,1433,1521,27017,6379,5984,9200,11211 -sV -T4", Scanner: "nmap"},
-		{ScanType: "mail_server", Name: "Mail Server Scan", Description: "Scan mail servers (SMTP, POP3, IMAP)", Arguments: "-p 25,110,143,465,587,993,995 -sV --script smtp-commands,pop3-capabilities,imap-capabilities -T4", Scanner: "nmap"},
-		{ScanType: "ftp_ssh_server", Name: "FTP/SSH Server Scan", Description: "Scan file transfer and remote access services", Arguments: "-p 20,21,22,23,990,2121,2222 -sV --script ftp-anon,ssh-auth-methods -T4", Scanner: "nmap"},
-		{ScanType: "service", Name: "Service Version Detection", Description: "Detect service versions and OS", Arguments: "-sV -O -T4", Scanner: "nmap"},
-		{ScanType: "vulnerability", Name: "Vulnerability Scan", Description: "Scan with NSE vulnerability scripts", Arguments: "-sV --script vuln -T4", Scanner: "nmap"},
-		{ScanType: "security_audit", Name: "Security Audit", Description: "Complete security audit with SSL/TLS checks", Arguments: "-p- -sV --script ssl-cert,ssl-enum-ciphers,ssh-auth-methods -T4", Scanner: "nmap"},
-		{ScanType: "stealth", Name: "Stealth Scan", Description: "SYN stealth scan with minimal footprint", Arguments: "-sS -T2 -f", Scanner: "nmap"},
-		{ScanType: "aggressive", Name: "Aggressive Scan", Description: "Aggressive scan with OS detection, version, scripts and traceroute", Arguments: "-A -T4", Scanner: "nmap"},
-		// Masscan templates
-		{ScanType: "masscan_quick", Name: "Masscan Quick Scan", Description: "Fast scan of common ports at high speed", Ports: "21,22,23,25,53,80,110,111,135,139,143,443,445,993,995,1723,3306,3389,5900,8080", Rate: 10000, Scanner: "masscan"},
-		{ScanType: "masscan_full", Name: "Masscan Full Port Scan", Description: "Scan all 65535 ports at high speed", Ports: "1-65535", Rate: 100000, Scanner: "masscan"},
-		{ScanType: "masscan_web", Name: "Masscan Web Ports", Description: "Scan common web server ports", Ports: "80,443,8080,8443,8000,8888,9000,9090,3000,5000", Rate: 10000, Scanner: "masscan"},
-		{ScanType: "masscan_database", Name: "Masscan Database Ports", Description: "Scan common database ports", Ports: "1433,1521,3306,5432,6379,27017,9200,5984", Rate: 10000, Scanner: "masscan"},
-		// DNS templates
-		{ScanType: "dns_records", Name: "DNS Records Scan", Description: "Query all DNS record types (A, AAAA, MX, NS, TXT)", Scanner: "dns"},
-		{ScanType: "dns_full", Name: "Full DNS Scan", Description: "Complete DNS reconnaissance including subdomain enumeration", Scanner: "dns"},
-		{ScanType: "dns_subdomain", Name: "Subdomain Enumeration", Description: "Discover subdomains using common wordlist", Scanner: "dns"},
+// builtinNmapArguments returns the nmap arguments of a builtin template
+func builtinNmapArguments(scanType string) (string, bool) {
+	for i := range builtinTemplates {
+		if tmpl := &builtinTemplates[i]; tmpl.ScanType == scanType && tmpl.Scanner == "nmap" {
+			return tmpl.Arguments, true
+		}
 	}
+	return "", false
+}
 
-	return c.JSON(templates)
+// builtinTemplates are the predefined scan templates for all scanners
+var builtinTemplates = []BuiltinTemplate{
+	// Nmap templates
+	{ScanType: "quick", Name: "Quick Scan", Description: "Fast scan of the most common 100 ports", Arguments: "-F -T4", Scanner: "nmap"},
+	{ScanType: "full", Name: "Full Port Scan", Description: "Comprehensive scan of all 65535 ports", Arguments: "-p- -T4", Scanner: "nmap"},
+	{ScanType: "udp", Name: "UDP Scan", Description: "Scan common UDP ports", Arguments: "-sU --top-ports 100 -T4", Scanner: "nmap"},
+	{ScanType: "discovery", Name: "Host Discovery", Description: "Discover active hosts in network (ping sweep)", Arguments: "-sn -PE -PP -PM --dns-servers 8.8.8.8,1.1.1.1 -T4", Scanner: "nmap"},
+	{ScanType: "local_network", Name: "Local Network Scan", Description: "Complete local network scan with MAC vendor identification", Arguments: "-sn -PR --dns-servers 8.8.8.8,1.1.1.1 -T4", Scanner: "nmap"},
+	{ScanType: "web_server", Name: "Web Server Scan", Description: "Scan web servers (HTTP/HTTPS) with service detection", Arguments: "-p 80,443,8080,8443,3000,5000,8000 -sV --script http-title,http-methods,http-headers -T4", Scanner: "nmap"},
+	{ScanType: "db_server", Name: "Database Server Scan", Description: "Scan common database ports with version detection", Arguments: "-p 3306,5432,1433,1521,27017,6379,5984,9200,11211 -sV -T4", Scanner: "nmap"},
+	{ScanType: "mail_server", Name: "Mail Server Scan", Description: "Scan mail servers (SMTP, POP3, IMAP)", Arguments: "-p 25,110,143,465,587,993,995 -sV --script smtp-commands,pop3-capabilities,imap-capabilities -T4", Scanner: "nmap"},
+	{ScanType: "ftp_ssh_server", Name: "FTP/SSH Server Scan", Description: "Scan file transfer and remote access services", Arguments: "-p 20,21,22,23,990,2121,2222 -sV --script ftp-anon,ssh-auth-methods -T4", Scanner: "nmap"},
+	{ScanType: "service", Name: "Service Version Detection", Description: "Detect service versions and OS", Arguments: "-sV -O -T4", Scanner: "nmap"},
+	{ScanType: "vulnerability", Name: "Vulnerability Scan", Description: "Scan with NSE vulnerability scripts", Arguments: "-sV --script vuln -T4", Scanner: "nmap"},
+	{ScanType: "security_audit", Name: "Security Audit", Description: "Complete security audit with SSL/TLS checks", Arguments: "-p- -sV --script ssl-cert,ssl-enum-ciphers,ssh-auth-methods -T4", Scanner: "nmap"},
+	{ScanType: "stealth", Name: "Stealth Scan", Description: "SYN stealth scan with minimal footprint", Arguments: "-sS -T2 -f", Scanner: "nmap"},
+	{ScanType: "aggressive", Name: "Aggressive Scan", Description: "Aggressive scan with OS detection, version, scripts and traceroute", Arguments: "-A -T4", Scanner: "nmap"},
+	// Masscan templates
+	{ScanType: "masscan_quick", Name: "Masscan Quick Scan", Description: "Fast scan of common ports at high speed", Ports: "21,22,23,25,53,80,110,111,135,139,143,443,445,993,995,1723,3306,3389,5900,8080", Rate: 10000, Scanner: "masscan"},
+	{ScanType: "masscan_full", Name: "Masscan Full Port Scan", Description: "Scan all 65535 ports at high speed", Ports: "1-65535", Rate: 100000, Scanner: "masscan"},
+	{ScanType: "masscan_web", Name: "Masscan Web Ports", Description: "Scan common web server ports", Ports: "80,443,8080,8443,8000,8888,9000,9090,3000,5000", Rate: 10000, Scanner: "masscan"},
+	{ScanType: "masscan_database", Name: "Masscan Database Ports", Description: "Scan common database ports", Ports: "1433,1521,3306,5432,6379,27017,9200,5984", Rate: 10000, Scanner: "masscan"},
+	// DNS templates
+	{ScanType: "dns_records", Name: "DNS Records Scan", Description: "Query all DNS record types (A, AAAA, MX, NS, TXT)", Scanner: "dns"},
+	{ScanType: "dns_full", Name: "Full DNS Scan", Description: "Complete DNS reconnaissance including subdomain enumeration", Scanner: "dns"},
+	{ScanType: "dns_subdomain", Name: "Subdomain Enumeration", Description: "Discover subdomains using common wordlist", Scanner: "dns"},
+}
+
+// ListBuiltinTemplates returns predefined scan templates for all scanners
+func (h *TemplateHandler) ListBuiltinTemplates(c *fiber.Ctx) error {
+	return c.JSON(builtinTemplates)
 }
 
 // VulnTemplate represents a vulnerability scan template
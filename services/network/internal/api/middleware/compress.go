@@ -0,0 +1,14 @@
+package middleware
+
+import (
+	"github.com/gofiber/fiber/v2"
+	"github.com/gofiber/fiber/v2/middleware/compress"
+)
+
+// Compress negotiates brotli/gzip/deflate from Accept-Encoding. LevelBestSpeed
+// keeps CPU cost low while still shrinking repetitive report markup and JSON.
+func Compress() fiber.Handler {
+	return compress.New(compress.Config{
+		Level: compress.LevelBestSpeed,
+	})
+}
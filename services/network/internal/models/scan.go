@@ -3,6 +3,7 @@ package models
 import (
 	"time"
 
+	"github.com/goccy/go-json"
 	"github.com/google/uuid"
 )
 
@@ -35,6 +36,64 @@ type ScanResult struct {
 	CreatedAt   time.Time              `json:"created_at"`
 }
 
+// ScanResultColumns lists the scan_results columns written by the scanners,
+// in the order returned by ScanResult.Values
+var ScanResultColumns = []string{
+	"id", "scan_id", "host", "hostname", "state", "ports", "os_detection",
+	"services", "mac_address", "mac_vendor", "created_at",
+}
+
+// Values returns the column values of the result in ScanResultColumns order,
+// ready to be used as a multi-row INSERT or COPY row. The JSONB columns are
+// encoded here with goccy/go-json and handed to pgx as raw JSON, instead of
+// letting pgx run them through encoding/json; nil values stay SQL NULL.
+func (r *ScanResult) Values() ([]interface{}, error) {
+	var ports, osDetection, services []byte
+	var err error
+	if r.Ports != nil {
+		if ports, err = marshalJSONArray(r.Ports, len(r.Ports)); err != nil {
+			return nil, err
+		}
+	}
+	if r.OSDetection != nil {
+		if osDetection, err = json.Marshal(r.OSDetection); err != nil {
+			return nil, err
+		}
+	}
+	if r.Services != nil {
+		if services, err = marshalJSONArray(r.Services, len(r.Services)); err != nil {
+			return nil, err
+		}
+	}
+
+	return []interface{}{
+		r.ID,
+		r.ScanID,
+		r.Host,
+		r.Hostname,
+		r.State,
+		ports,
+		osDetection,
+		services,
+		r.MacAddress,
+		r.MacVendor,
+		r.CreatedAt,
+	}, nil
+}
+
+// emptyJSONArray is the encoding of the empty ports/services lists that host
+// discovery (ping sweep) results carry
+var emptyJSONArray = []byte("[]")
+
+// marshalJSONArray encodes a slice of length n, skipping the encoder for the
+// empty slices that make up most rows of a ping sweep
+func marshalJSONArray(v interface{}, n int) ([]byte, error) {
+	if n == 0 {
+		return emptyJSONArray, nil
+	}
+	return json.Marshal(v)
+}
+
 type Port struct {
 	Port      int    `json:"port"`
 	Protocol  string `json:"protocol"`
@@ -0,0 +1,43 @@
+package scanner
+
+import (
+	"context"
+	"sync"
+)
+
+// activeScans tracks the cancel functions of the scans a scanner is running.
+// Scans start, finish and get cancelled from different goroutines, so every
+// access goes through the mutex.
+type activeScans struct {
+	mu          sync.Mutex
+	cancelFuncs map[string]context.CancelFunc
+}
+
+func newActiveScans() *activeScans {
+	return &activeScans{cancelFuncs: make(map[string]context.CancelFunc)}
+}
+
+// add registers the cancel function of a running scan
+func (a *activeScans) add(scanID string, cancel context.CancelFunc) {
+	a.mu.Lock()
+	a.cancelFuncs[scanID] = cancel
+	a.mu.Unlock()
+}
+
+// remove forgets a scan once it has finished
+func (a *activeScans) remove(scanID string) {
+	a.mu.Lock()
+	delete(a.cancelFuncs, scanID)
+	a.mu.Unlock()
+}
+
+// cancel stops a running scan and reports whether it was found
+func (a *activeScans) cancel(scanID string) bool {
+	a.mu.Lock()
+	cancel, ok := a.cancelFuncs[scanID]
+	a.mu.Unlock()
+	if ok {
+		cancel()
+	}
+	return ok
+}
@@ -14,9 +14,9 @@ import (
 )
 
 type DNSScanner struct {
-	db          *database.Database
-	cancelFuncs map[string]context.CancelFunc
-	resolver    *net.Resolver
+	db       *database.Database
+	active   *activeScans
+	resolver *net.Resolver
 }
 
 // DNSRecord represents a DNS record
@@ -40,8 +40,8 @@ type DNSScanResult struct {
 
 func NewDNSScanner(db *database.Database) *DNSScanner {
 	return &DNSScanner{
-		db:          db,
-		cancelFuncs: make(map[string]context.CancelFunc),
+		db:     db,
+		active: newActiveScans(),
 		resolver: &net.Resolver{
 			PreferGo: true,
 			Dial: func(ctx context.Context, network, address string) (net.Conn, error) {
@@ -56,11 +56,12 @@ func NewDNSScanner(db *database.Database) *DNSScanner {
 func (s *DNSScanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, domain string, scanType string) error {
 	log.Printf("🔍 Starting DNS scan %s on domain: %s type: %s", scanID, domain, scanType)
 
-	// Create cancellable context
+	// Create cancellable context; the parent one is only cancelled at shutdown
+	parent := ctx
 	ctx, cancel := context.WithCancel(ctx)
-	s.cancelFuncs[scanID.String()] = cancel
+	s.active.add(scanID.String(), cancel)
 	defer func() {
-		delete(s.cancelFuncs, scanID.String())
+		s.active.remove(scanID.String())
 		cancel()
 	}()
 
@@ -88,22 +89,18 @@ func (s *DNSScanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, domain s
 
 	// Check if context was cancelled
 	if ctx.Err() == context.Canceled {
-		s.addLog(context.Background(), scanID, "info", "Scan was cancelled by user")
-		return nil
+		return markScanCancelled(s.db, scanID, cancelledMessage(parent))
 	}
 
-	// Store results as ScanResult
+	// Store the result, mark the scan completed and log it in one transaction
 	result := s.convertToScanResult(scanID, domain, &dnsResult)
-	if err := s.storeResult(ctx, result); err != nil {
-		log.Printf("Failed to store result: %v", err)
+	message := fmt.Sprintf("DNS scan completed. Found %d records", len(dnsResult.Records))
+	if err := completeScan(ctx, s.db, scanID, []models.ScanResult{*result}, message); err != nil {
+		errMsg := err.Error()
+		failScan(ctx, s.db, scanID, errMsg, fmt.Sprintf("Failed to store result: %s", errMsg))
+		return err
 	}
 
-	// Update scan status to completed
-	if err := s.updateScanStatus(ctx, scanID, "completed", 100, nil); err != nil {
-		return fmt.Errorf("failed to update scan status: %w", err)
-	}
-
-	s.addLog(ctx, scanID, "success", fmt.Sprintf("DNS scan completed. Found %d records", len(dnsResult.Records)))
 	log.Printf("✅ DNS scan %s completed. Found %d records", scanID, len(dnsResult.Records))
 
 	return nil
@@ -375,70 +372,44 @@ func (s *DNSScanner) convertToScanResult(scanID uuid.UUID, domain string, dnsRes
 
 // CancelScan cancels a running scan
 func (s *DNSScanner) CancelScan(scanID string) {
-	if cancel, ok := s.cancelFuncs[scanID]; ok {
-		cancel()
+	if s.active.cancel(scanID) {
 		log.Printf("🛑 Cancelled DNS scan %s", scanID)
 	}
 }
 
 func (s *DNSScanner) updateScanStatus(ctx context.Context, scanID uuid.UUID, status string, progress int, errorMsg *string) error {
-	query := `
-		UPDATE scans
-		SET status = $1, progress = $2, error_message = $3,
-		    started_at = CASE WHEN $4 = 'running' AND started_at IS NULL THEN NOW() ELSE started_at END,
-		    completed_at = CASE WHEN $5 IN ('completed', 'failed') THEN NOW() ELSE completed_at END
-		WHERE id = $6
-	`
-	_, err := s.db.Pool.Exec(ctx, query, status, progress, errorMsg, status, status, scanID)
+	_, err := s.db.Pool.Exec(ctx, updateScanStatusQuery, status, progress, errorMsg, scanID)
 	return err
 }
 
 func (s *DNSScanner) addLog(ctx context.Context, scanID uuid.UUID, level, message string) {
-	query := `INSERT INTO scan_logs (id, scan_id, level, message, created_at) VALUES ($1, $2, $3, $4, $5)`
-	_, err := s.db.Pool.Exec(ctx, query, uuid.New(), scanID, level, message, time.Now())
+	_, err := s.db.Pool.Exec(ctx, insertScanLogQuery, uuid.New(), scanID, level, message, time.Now())
 	if err != nil {
 		log.Printf("Failed to add log: %v", err)
 	}
 }
 
-func (s *DNSScanner) storeResult(ctx context.Context, result *models.ScanResult) error {
-	query := `
-		INSERT INTO scan_results (id, scan_id, host, hostname, state, ports, os_detection, services, mac_address, mac_vendor, created_at)
-		VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-	`
-	_, err := s.db.Pool.Exec(ctx, query,
-		result.ID,
-		result.ScanID,
-		result.Host,
-		result.Hostname,
-		result.State,
-		result.Ports,
-		result.OSDetection,
-		result.Services,
-		result.MacAddress,
-		result.MacVendor,
-		result.CreatedAt,
-	)
-	return err
-}
-
 // GetTemplates returns predefined DNS scan templates
 func (s *DNSScanner) GetTemplates() map[string]map[string]interface{} {
-	return map[string]map[string]interface{}{
-		"dns_records": {
-			"name":        "DNS Records Scan",
-			"description": "Query all DNS record types (A, AAAA, MX, NS, TXT)",
-			"scan_type":   "dns_records",
-		},
-		"dns_full": {
-			"name":        "Full DNS Scan",
-			"description": "Complete DNS reconnaissance including subdomain enumeration",
-			"scan_type":   "dns_full",
-		},
-		"dns_subdomain": {
-			"name":        "Subdomain Enumeration",
-			"description": "Discover subdomains using common wordlist",
-			"scan_type":   "dns_subdomain",
-		},
-	}
+	return dnsTemplates
+}
+
+// dnsTemplates holds the predefined DNS scan templates; it is built once
+// and shared by every caller, which must treat it as read-only
+var dnsTemplates = map[string]map[string]interface{}{
+	"dns_records": {
+		"name":        "DNS Records Scan",
+		"description": "Query all DNS record types (A, AAAA, MX, NS, TXT)",
+		"scan_type":   "dns_records",
+	},
+	"dns_full": {
+		"name":        "Full DNS Scan",
+		"description": "Complete DNS reconnaissance including subdomain enumeration",
+		"scan_type":   "dns_full",
+	},
+	"dns_subdomain": {
+		"name":        "Subdomain Enumeration",
+		"description": "Discover subdomains using common wordlist",
+		"scan_type":   "dns_subdomain",
+	},
 }
@@ -19,7 +19,7 @@ import (
 type MasscanScanner struct {
 	db          *database.Database
 	masscanPath string
-	cancelFuncs map[string]context.CancelFunc
+	active      *activeScans
 }
 
 // MasscanResult represents the JSON output from masscan
@@ -42,7 +42,7 @@ func NewMasscanScanner(db *database.Database, masscanPath string) *MasscanScanne
 	return &MasscanScanner{
 		db:          db,
 		masscanPath: masscanPath,
-		cancelFuncs: make(map[string]context.CancelFunc),
+		active:      newActiveScans(),
 	}
 }
 
@@ -50,11 +50,12 @@ func NewMasscanScanner(db *database.Database, masscanPath string) *MasscanScanne
 func (s *MasscanScanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, target string, ports string, rate int) error {
 	log.Printf("🚀 Starting Masscan scan %s on target: %s ports: %s rate: %d", scanID, target, ports, rate)
 
-	// Create cancellable context
+	// Create cancellable context; the parent one is only cancelled at shutdown
+	parent := ctx
 	ctx, cancel := context.WithCancel(ctx)
-	s.cancelFuncs[scanID.String()] = cancel
+	s.active.add(scanID.String(), cancel)
 	defer func() {
-		delete(s.cancelFuncs, scanID.String())
+		s.active.remove(scanID.String())
 		cancel()
 	}()
 
@@ -100,8 +101,7 @@ func (s *MasscanScanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, targ
 
 	if err := cmd.Start(); err != nil {
 		errMsg := err.Error()
-		s.updateScanStatus(ctx, scanID, "failed", 0, &errMsg)
-		s.addLog(ctx, scanID, "error", fmt.Sprintf("Failed to start masscan: %s", errMsg))
+		failScan(ctx, s.db, scanID, errMsg, fmt.Sprintf("Failed to start masscan: %s", errMsg))
 		return fmt.Errorf("failed to start masscan: %w", err)
 	}
 
@@ -138,61 +138,56 @@ func (s *MasscanScanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, targ
 		}
 
 		// Group ports by IP
-		if _, exists := results[masscanResult.IP]; !exists {
-			results[masscanResult.IP] = &models.ScanResult{
-				ID:        uuid.New(),
-				ScanID:    scanID,
-				Host:      masscanResult.IP,
-				State:     "up",
-				Ports:     []models.Port{},
-				Services:  []string{},
-				CreatedAt: time.Now(),
+		result, exists := results[masscanResult.IP]
+		if !exists {
+			result = &models.ScanResult{
+				ID:       uuid.New(),
+				ScanID:   scanID,
+				Host:     masscanResult.IP,
+				State:    "up",
+				Ports:    []models.Port{},
+				Services: []string{},
 			}
+			results[masscanResult.IP] = result
 		}
 
 		for _, port := range masscanResult.Ports {
-			results[masscanResult.IP].Ports = append(results[masscanResult.IP].Ports, models.Port{
+			result.Ports = append(result.Ports, models.Port{
 				Port:     port.Port,
 				Protocol: port.Protocol,
 				State:    port.Status,
 				Service:  "unknown", // Masscan doesn't do service detection
 			})
-			results[masscanResult.IP].Services = append(results[masscanResult.IP].Services,
-				fmt.Sprintf("%d/%s", port.Port, port.Protocol))
+			result.Services = append(result.Services, strconv.Itoa(port.Port)+"/"+port.Protocol)
 		}
 	}
 
-	// Check if context was cancelled
+	// Always wait so a killed masscan process is reaped, then check whether
+	// the scan was cancelled
+	err = cmd.Wait()
 	if ctx.Err() == context.Canceled {
-		s.addLog(context.Background(), scanID, "info", "Scan was cancelled by user")
-		return nil
+		return markScanCancelled(s.db, scanID, cancelledMessage(parent))
 	}
-
-	if err := cmd.Wait(); err != nil {
-		// Check if it was cancelled
-		if ctx.Err() == context.Canceled {
-			s.addLog(context.Background(), scanID, "info", "Scan was cancelled by user")
-			return nil
-		}
+	if err != nil {
 		errMsg := err.Error()
-		s.updateScanStatus(ctx, scanID, "failed", 0, &errMsg)
-		s.addLog(ctx, scanID, "error", fmt.Sprintf("Masscan failed: %s", errMsg))
+		failScan(ctx, s.db, scanID, errMsg, fmt.Sprintf("Masscan failed: %s", errMsg))
 		return fmt.Errorf("masscan failed: %w", err)
 	}
 
-	// Store results
+	// Store results, mark the scan completed and log it in one transaction
+	now := time.Now()
+	hostResults := make([]models.ScanResult, 0, len(results))
 	for _, result := range results {
-		if err := s.storeResult(ctx, result); err != nil {
-			log.Printf("Failed to store result: %v", err)
-		}
+		result.CreatedAt = now
+		hostResults = append(hostResults, *result)
 	}
-
-	// Update scan status to completed
-	if err := s.updateScanStatus(ctx, scanID, "completed", 100, nil); err != nil {
-		return fmt.Errorf("failed to update scan status: %w", err)
+	message := fmt.Sprintf("Masscan completed. Found %d hosts with open ports", len(results))
+	if err := completeScan(ctx, s.db, scanID, hostResults, message); err != nil {
+		errMsg := err.Error()
+		failScan(ctx, s.db, scanID, errMsg, fmt.Sprintf("Failed to store results: %s", errMsg))
+		return err
 	}
 
-	s.addLog(ctx, scanID, "success", fmt.Sprintf("Masscan completed. Found %d hosts with open ports", len(results)))
 	log.Printf("✅ Masscan %s completed. Found %d hosts", scanID, len(results))
 
 	return nil
@@ -200,79 +195,53 @@ func (s *MasscanScanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, targ
 
 // CancelScan cancels a running scan
 func (s *MasscanScanner) CancelScan(scanID string) {
-	if cancel, ok := s.cancelFuncs[scanID]; ok {
-		cancel()
+	if s.active.cancel(scanID) {
 		log.Printf("🛑 Cancelled Masscan scan %s", scanID)
 	}
 }
 
 func (s *MasscanScanner) updateScanStatus(ctx context.Context, scanID uuid.UUID, status string, progress int, errorMsg *string) error {
-	query := `
-		UPDATE scans
-		SET status = $1, progress = $2, error_message = $3,
-		    started_at = CASE WHEN $4 = 'running' AND started_at IS NULL THEN NOW() ELSE started_at END,
-		    completed_at = CASE WHEN $5 IN ('completed', 'failed') THEN NOW() ELSE completed_at END
-		WHERE id = $6
-	`
-	_, err := s.db.Pool.Exec(ctx, query, status, progress, errorMsg, status, status, scanID)
+	_, err := s.db.Pool.Exec(ctx, updateScanStatusQuery, status, progress, errorMsg, scanID)
 	return err
 }
 
 func (s *MasscanScanner) addLog(ctx context.Context, scanID uuid.UUID, level, message string) {
-	query := `INSERT INTO scan_logs (id, scan_id, level, message, created_at) VALUES ($1, $2, $3, $4, $5)`
-	_, err := s.db.Pool.Exec(ctx, query, uuid.New(), scanID, level, message, time.Now())
+	_, err := s.db.Pool.Exec(ctx, insertScanLogQuery, uuid.New(), scanID, level, message, time.Now())
 	if err != nil {
 		log.Printf("Failed to add log: %v", err)
 	}
 }
 
-func (s *MasscanScanner) storeResult(ctx context.Context, result *models.ScanResult) error {
-	query := `
-		INSERT INTO scan_results (id, scan_id, host, hostname, state, ports, os_detection, services, mac_address, mac_vendor, created_at)
-		VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-	`
-	_, err := s.db.Pool.Exec(ctx, query,
-		result.ID,
-		result.ScanID,
-		result.Host,
-		result.Hostname,
-		result.State,
-		result.Ports,
-		result.OSDetection,
-		result.Services,
-		result.MacAddress,
-		result.MacVendor,
-		result.CreatedAt,
-	)
-	return err
-}
-
 // GetTemplates returns predefined masscan templates
 func (s *MasscanScanner) GetTemplates() map[string]map[string]interface{} {
-	return map[string]map[string]interface{}{
-		"masscan_quick": {
-			"name":        "Masscan Quick Scan",
-			"description": "Fast scan of common ports (top 100)",
-			"ports":       "21,22,23,25,53,80,110,111,135,139,143,443,445,993,995,1723,3306,3389,5900,8080",
-			"rate":        10000,
-		},
-		"masscan_full": {
-			"name":        "Masscan Full Port Scan",
-			"description": "Scan all 65535 ports at high speed",
-			"ports":       "1-65535",
-			"rate":        100000,
-		},
-		"masscan_web": {
-			"name":        "Masscan Web Ports",
-			"description": "Scan common web server ports",
-			"ports":       "80,443,8080,8443,8000,8888,9000,9090,3000,5000",
-			"rate":        10000,
-		},
-		"masscan_database": {
-			"name":        "Masscan Database Ports",
-			"description": "Scan common database ports",
-			"ports":       "1433,1521,3306,5432,6379,27017,9200,5984",
-			"rate":        10000,
-		},
-	}
+	return masscanTemplates
+}
+
+// masscanTemplates holds the predefined masscan templates; it is built once
+// and shared by every caller, which must treat it as read-only
+var masscanTemplates = map[string]map[string]interface{}{
+	"masscan_quick": {
+		"name":        "Masscan Quick Scan",
+		"description": "Fast scan of common ports (top 100)",
+		"ports":       "21,22,23,25,53,80,110,111,135,139,143,443,445,993,995,1723,3306,3389,5900,8080",
+		"rate":        10000,
+	},
+	"masscan_full": {
+		"name":        "Masscan Full Port Scan",
+		"description": "Scan all 65535 ports at high speed",
+		"ports":       "1-65535",
+		"rate":        100000,
+	},
+	"masscan_web": {
+		"name":        "Masscan Web Ports",
+		"description": "Scan common web server ports",
+		"ports":       "80,443,8080,8443,8000,8888,9000,9090,3000,5000",
+		"rate":        10000,
+	},
+	"masscan_database": {
+		"name":        "Masscan Database Ports",
+		"description": "Scan common database ports",
+		"ports":       "1433,1521,3306,5432,6379,27017,9200,5984",
+		"rate":        10000,
+	},
 }
@@ -2,9 +2,12 @@ package scanner
 
 import (
 	"context"
+	"encoding/xml"
 	"fmt"
+	"io"
 	"log"
 	"os/exec"
+	"strconv"
 	"strings"
 	"time"
 
@@ -18,7 +21,7 @@ type Scanner struct {
 	db            *database.Database
 	useSystemNmap bool
 	nmapPath      string
-	cancelFuncs   map[string]context.CancelFunc
+	active        *activeScans
 }
 
 func NewScanner(db *database.Database, useSystemNmap bool, nmapPath string) *Scanner {
@@ -26,7 +29,7 @@ func NewScanner(db *database.Database, useSystemNmap bool, nmapPath string) *Sca
 		db:            db,
 		useSystemNmap: useSystemNmap,
 		nmapPath:      nmapPath,
-		cancelFuncs:   make(map[string]context.CancelFunc),
+		active:        newActiveScans(),
 	}
 }
 
@@ -34,11 +37,12 @@ func NewScanner(db *database.Database, useSystemNmap bool, nmapPath string) *Sca
 func (s *Scanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, target string, arguments string) error {
 	log.Printf("🔍 Starting scan %s on target: %s with args: %s", scanID, target, arguments)
 
-	// Create cancellable context
+	// Create cancellable context; the parent one is only cancelled at shutdown
+	parent := ctx
 	ctx, cancel := context.WithCancel(ctx)
-	s.cancelFuncs[scanID.String()] = cancel
+	s.active.add(scanID.String(), cancel)
 	defer func() {
-		delete(s.cancelFuncs, scanID.String())
+		s.active.remove(scanID.String())
 		cancel()
 	}()
 
@@ -61,28 +65,23 @@ func (s *Scanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, target stri
 
 	// Check if context was cancelled
 	if ctx.Err() == context.Canceled {
-		s.addLog(context.Background(), scanID, "info", "Scan was cancelled by user")
-		return nil
+		return markScanCancelled(s.db, scanID, cancelledMessage(parent))
 	}
 
 	if scanErr != nil {
 		errMsg := scanErr.Error()
-		s.updateScanStatus(ctx, scanID, "failed", 0, &errMsg)
-		s.addLog(ctx, scanID, "error", fmt.Sprintf("Scan failed: %s", errMsg))
+		failScan(ctx, s.db, scanID, errMsg, fmt.Sprintf("Scan failed: %s", errMsg))
 		return scanErr
 	}
 
-	// Store results in database
-	if err := s.storeResults(ctx, scanID, results); err != nil {
-		log.Printf("Failed to store results: %v", err)
+	// Store results, mark the scan completed and log it in one transaction
+	s.prepareResults(scanID, results)
+	if err := completeScan(ctx, s.db, scanID, results, "Scan completed successfully"); err != nil {
+		errMsg := err.Error()
+		failScan(ctx, s.db, scanID, errMsg, fmt.Sprintf("Failed to store results: %s", errMsg))
+		return err
 	}
 
-	// Update scan status to completed
-	if err := s.updateScanStatus(ctx, scanID, "completed", 100, nil); err != nil {
-		return fmt.Errorf("failed to update scan status: %w", err)
-	}
-
-	s.addLog(ctx, scanID, "success", "Scan completed successfully")
 	log.Printf("✅ Scan %s completed successfully. Found %d hosts", scanID, len(results))
 
 	return nil
@@ -90,8 +89,7 @@ func (s *Scanner) ExecuteScan(ctx context.Context, scanID uuid.UUID, target stri
 
 // CancelScan cancels a running scan by its ID
 func (s *Scanner) CancelScan(scanID string) {
-	if cancel, ok := s.cancelFuncs[scanID]; ok {
-		cancel()
+	if s.active.cancel(scanID) {
 		log.Printf("🛑 Cancelled scan %s", scanID)
 	}
 }
@@ -139,161 +137,187 @@ func (s *Scanner) runSystemNmap(ctx context.Context, scanID uuid.UUID, target st
 
 	cmd := exec.CommandContext(ctx, s.nmapPath, args...)
 
-	output, err := cmd.Output()
+	stdout, err := cmd.StdoutPipe()
 	if err != nil {
+		return nil, fmt.Errorf("failed to create stdout pipe: %w", err)
+	}
+	if err := cmd.Start(); err != nil {
 		return nil, fmt.Errorf("system nmap failed: %w", err)
 	}
 
-	// Parse XML output using gonmap
-	var result nmap.Run
-	if err := nmap.Parse(output, &result); err != nil {
-		return nil, fmt.Errorf("failed to parse nmap output: %w", err)
+	// Parse the XML while nmap writes it instead of buffering the whole output
+	results, parseErr := parseNmapXML(stdout)
+	if parseErr != nil {
+		// Drain the pipe so nmap is not blocked writing and Wait can return
+		io.Copy(io.Discard, stdout)
+	}
+
+	if err := cmd.Wait(); err != nil {
+		return nil, fmt.Errorf("system nmap failed: %w", err)
+	}
+	if parseErr != nil {
+		return nil, fmt.Errorf("failed to parse nmap output: %w", parseErr)
 	}
 
-	return s.parseGonmapResults(&result), nil
+	return results, nil
 }
 
-// parseGonmapResults converts gonmap results to our models
-func (s *Scanner) parseGonmapResults(result *nmap.Run) []models.ScanResult {
+// parseNmapXML decodes nmap XML output one <host> element at a time, converting
+// each host as soon as it is read so only a single nmap.Host is held in memory
+func parseNmapXML(r io.Reader) ([]models.ScanResult, error) {
 	var results []models.ScanResult
 
-	for _, host := range result.Hosts {
-		if len(host.Addresses) == 0 {
-			continue
+	decoder := xml.NewDecoder(r)
+	for {
+		token, err := decoder.Token()
+		if err == io.EOF {
+			return results, nil
+		}
+		if err != nil {
+			return nil, err
 		}
 
-		scanResult := models.ScanResult{
-			ID:        uuid.New(),
-			Host:      host.Addresses[0].Addr,
-			State:     string(host.Status.State),
-			Ports:     []models.Port{},
-			Services:  []string{},
-			CreatedAt: time.Now(),
+		start, ok := token.(xml.StartElement)
+		if !ok || start.Name.Local != "host" {
+			continue
 		}
 
-		// Hostname
-		if len(host.Hostnames) > 0 {
-			scanResult.Hostname = &host.Hostnames[0].Name
+		var host nmap.Host
+		if err := decoder.DecodeElement(&host, &start); err != nil {
+			return nil, err
+		}
+		if scanResult, ok := parseNmapHost(&host); ok {
+			results = append(results, scanResult)
 		}
+	}
+}
 
-		// MAC address and vendor
-		for _, addr := range host.Addresses {
-			if addr.AddrType == "mac" {
-				scanResult.MacAddress = &addr.Addr
-				if addr.Vendor != "" {
-					scanResult.MacVendor = &addr.Vendor
-				}
-			}
+// parseGonmapResults converts gonmap results to our models. It only maps the
+// parsed XML; IDs, scan ID and timestamps are stamped afterwards in a single
+// pass by prepareResults, right before the results are stored.
+func (s *Scanner) parseGonmapResults(result *nmap.Run) []models.ScanResult {
+	var results []models.ScanResult
+
+	// Index into the slices instead of ranging by value so each nmap.Host and
+	// nmap.Port struct is not copied on every iteration
+	for i := range result.Hosts {
+		if scanResult, ok := parseNmapHost(&result.Hosts[i]); ok {
+			results = append(results, scanResult)
 		}
+	}
 
-		// Ports
-		for _, port := range host.Ports {
-			portInfo := models.Port{
-				Port:     int(port.ID),
-				Protocol: port.Protocol,
-				State:    string(port.State.State),
-				Service:  port.Service.Name,
-			}
+	return results
+}
 
-			if port.Service.Product != "" {
-				portInfo.Product = port.Service.Product
-			}
-			if port.Service.Version != "" {
-				portInfo.Version = port.Service.Version
-			}
-			if port.Service.ExtraInfo != "" {
-				portInfo.ExtraInfo = port.Service.ExtraInfo
-			}
+// parseNmapHost converts a single nmap host to our model. Hosts without an
+// address are skipped.
+func parseNmapHost(host *nmap.Host) (models.ScanResult, bool) {
+	if len(host.Addresses) == 0 {
+		return models.ScanResult{}, false
+	}
 
-			scanResult.Ports = append(scanResult.Ports, portInfo)
-			scanResult.Services = append(scanResult.Services,
-				fmt.Sprintf("%d/%s - %s", port.ID, port.Protocol, port.Service.Name))
+	scanResult := models.ScanResult{
+		Host:     host.Addresses[0].Addr,
+		State:    string(host.Status.State),
+		Ports:    make([]models.Port, 0, len(host.Ports)),
+		Services: make([]string, 0, len(host.Ports)),
+	}
+
+	// Hostname
+	if len(host.Hostnames) > 0 {
+		scanResult.Hostname = &host.Hostnames[0].Name
+	}
+
+	// MAC address and vendor; nmap reports at most one MAC per host, so stop
+	// at the first one
+	for j := range host.Addresses {
+		addr := &host.Addresses[j]
+		if addr.AddrType == "mac" {
+			scanResult.MacAddress = &addr.Addr
+			if addr.Vendor != "" {
+				scanResult.MacVendor = &addr.Vendor
+			}
+			break
 		}
+	}
 
-		results = append(results, scanResult)
+	// Ping sweeps (-sn) report hosts without ports; nothing left to convert
+	if len(host.Ports) == 0 {
+		return scanResult, true
 	}
 
-	return results
+	// Ports
+	for j := range host.Ports {
+		port := &host.Ports[j]
+		service := &port.Service
+
+		// Optional fields are copied as-is: an empty string is their zero value
+		scanResult.Ports = append(scanResult.Ports, models.Port{
+			Port:      int(port.ID),
+			Protocol:  port.Protocol,
+			State:     string(port.State.State),
+			Service:   service.Name,
+			Product:   service.Product,
+			Version:   service.Version,
+			ExtraInfo: service.ExtraInfo,
+		})
+		scanResult.Services = append(scanResult.Services,
+			strconv.Itoa(int(port.ID))+"/"+port.Protocol+" - "+service.Name)
+	}
+
+	return scanResult, true
 }
 
 // updateScanStatus updates scan status in database
 func (s *Scanner) updateScanStatus(ctx context.Context, scanID uuid.UUID, status string, progress int, errorMsg *string) error {
-	query := `
-		UPDATE scans
-		SET status = $1, progress = $2, error_message = $3,
-		    started_at = CASE WHEN $4 = 'running' AND started_at IS NULL THEN NOW() ELSE started_at END,
-		    completed_at = CASE WHEN $5 IN ('completed', 'failed') THEN NOW() ELSE completed_at END
-		WHERE id = $6
-	`
-	_, err := s.db.Pool.Exec(ctx, query, status, progress, errorMsg, status, status, scanID)
+	_, err := s.db.Pool.Exec(ctx, updateScanStatusQuery, status, progress, errorMsg, scanID)
 	return err
 }
 
 // addLog adds a log entry for the scan
 func (s *Scanner) addLog(ctx context.Context, scanID uuid.UUID, level, message string) {
-	query := `INSERT INTO scan_logs (id, scan_id, level, message, created_at) VALUES ($1, $2, $3, $4, $5)`
-	_, err := s.db.Pool.Exec(ctx, query, uuid.New(), scanID, level, message, time.Now())
+	_, err := s.db.Pool.Exec(ctx, insertScanLogQuery, uuid.New(), scanID, level, message, time.Now())
 	if err != nil {
 		log.Printf("Failed to add log: %v", err)
 	}
 }
 
-// storeResults stores scan results in database
-func (s *Scanner) storeResults(ctx context.Context, scanID uuid.UUID, results []models.ScanResult) error {
-	for _, result := range results {
-		result.ScanID = scanID
-		result.ID = uuid.New()
-		result.CreatedAt = time.Now()
-
-		query := `
-			INSERT INTO scan_results (id, scan_id, host, hostname, state, ports, os_detection, services, mac_address, mac_vendor, created_at)
-			VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-		`
-
-		_, err := s.db.Pool.Exec(ctx, query,
-			result.ID,
-			result.ScanID,
-			result.Host,
-			result.Hostname,
-			result.State,
-			result.Ports,
-			result.OSDetection,
-			result.Services,
-			result.MacAddress,
-			result.MacVendor,
-			result.CreatedAt,
-		)
-
-		if err != nil {
-			return fmt.Errorf("failed to insert scan result: %w", err)
-		}
+// prepareResults assigns the scan, IDs and creation time to parsed results
+func (s *Scanner) prepareResults(scanID uuid.UUID, results []models.ScanResult) {
+	now := time.Now()
+	for i := range results {
+		results[i].ScanID = scanID
+		results[i].ID = uuid.New()
+		results[i].CreatedAt = now
 	}
-
-	return nil
 }
 
 // GetScanTemplates returns predefined scan templates
 func (s *Scanner) GetScanTemplates() map[string]map[string]string {
-	return map[string]map[string]string{
-		"quick": {
-			"name":        "Quick Scan",
-			"arguments":   "-F -T4",
-			"description": "Fast scan of the most common 100 ports",
-		},
-		"full": {
-			"name":        "Full Port Scan",
-			"arguments":   "-p- -T4",
-			"description": "Comprehensive scan of all 65535 ports",
-		},
-		"service": {
-			"name":        "Service Version Detection",
-			"arguments":   "-sV -O -T4",
-			"description": "Detect service versions and OS",
-		},
-		"web_server": {
-			"name":        "Web Server Scan",
-			"arguments":   "-p 80,443,8080,8443,3000,5000,8000 -sV -T4",
-			"description": "Scan web servers with service detection",
-		},
-	}
+	return nmapScanTemplates
+}
+
+// nmapScanTemplates holds the predefined nmap templates; it is built once
+// and shared by every caller, which must treat it as read-only
+var nmapScanTemplates = map[string]map[string]string{
+	"quick": {
+		"name":        "Quick Scan",
+		"arguments":   "-F -T4",
+		"description": "Fast scan of the most common 100 ports",
+	},
+	"full": {
+		"name":        "Full Port Scan",
+		"arguments":   "-p- -T4",
+		"description": "Comprehensive scan of all 65535 ports",
+	},
+	"service": {
+		"name":        "Service Version Detection",
+		"arguments":   "-sV -O -T4",
+		"description": "Detect service versions and OS",
+	},
+	"web_server": {
+		"name":        "Web Server Scan",
+		"arguments":   "-p 80,443,8080,8443,3000,5000,8000 -sV -T4",
+		"description": "Scan web servers with service detection",
+	},
 }
@@ -0,0 +1,139 @@
+package scanner
+
+import (
+	"context"
+	"fmt"
+	"time"
+
+	"github.com/google/uuid"
+	"github.com/jackc/pgx/v5"
+	"github.com/nmap-scanner/backend-go/internal/database"
+	"github.com/nmap-scanner/backend-go/internal/models"
+)
+
+// copyThreshold is the number of results from which storeScanResults switches
+// from a batch of INSERTs to a COPY into scan_results
+const copyThreshold = 100
+
+const insertScanResultQuery = `
+	INSERT INTO scan_results (id, scan_id, host, hostname, state, ports, os_detection, services, mac_address, mac_vendor, created_at)
+	VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+`
+
+// updateScanStatusQuery sets status, progress and error message, stamping
+// started_at/completed_at from the new status. The status is bound once as
+// $1; the ::text casts keep its type consistent across the three uses.
+const updateScanStatusQuery = `
+	UPDATE scans
+	SET status = $1::text, progress = $2, error_message = $3,
+	    started_at = CASE WHEN $1::text = 'running' AND started_at IS NULL THEN NOW() ELSE started_at END,
+	    completed_at = CASE WHEN $1::text IN ('completed', 'failed', 'cancelled') THEN NOW() ELSE completed_at END
+	WHERE id = $4
+`
+
+// cancelScanQuery marks a scan cancelled without touching its progress
+const cancelScanQuery = `UPDATE scans SET status = 'cancelled', completed_at = NOW() WHERE id = $1`
+
+const insertScanLogQuery = `INSERT INTO scan_logs (id, scan_id, level, message, created_at) VALUES ($1, $2, $3, $4, $5)`
+
+// insertScanLogIfExistsQuery logs only while the scan row still exists; a scan
+// deleted while running is cancelled after its row (and logs) are gone
+const insertScanLogIfExistsQuery = `
+	INSERT INTO scan_logs (id, scan_id, level, message, created_at)
+	SELECT $1, $2, $3, $4, $5
+	WHERE EXISTS (SELECT 1 FROM scans WHERE id = $2)
+`
+
+// storeScanResults inserts scan results for all scanners within tx. Small
+// result sets are queued as a single batch of INSERTs so they reach the
+// database in one round trip; large ones (e.g. discovery over a /16) are
+// streamed with COPY.
+func storeScanResults(ctx context.Context, tx pgx.Tx, results []models.ScanResult) error {
+	if len(results) == 0 {
+		return nil
+	}
+
+	if len(results) >= copyThreshold {
+		_, err := tx.CopyFrom(ctx, pgx.Identifier{"scan_results"}, models.ScanResultColumns,
+			pgx.CopyFromSlice(len(results), func(i int) ([]interface{}, error) {
+				return results[i].Values()
+			}))
+		if err != nil {
+			return fmt.Errorf("failed to copy scan results: %w", err)
+		}
+		return nil
+	}
+
+	batch := &pgx.Batch{}
+	for i := range results {
+		values, err := results[i].Values()
+		if err != nil {
+			return fmt.Errorf("failed to encode scan result: %w", err)
+		}
+		batch.Queue(insertScanResultQuery, values...)
+	}
+
+	br := tx.SendBatch(ctx, batch)
+	defer br.Close()
+
+	for range results {
+		if _, err := br.Exec(); err != nil {
+			return fmt.Errorf("failed to insert scan result: %w", err)
+		}
+	}
+
+	return br.Close()
+}
+
+// completeScan stores the results of a finished scan, marks it completed and
+// adds the final log entry in a single transaction, so a scan is never seen
+// as completed without its results
+func completeScan(ctx context.Context, db *database.Database, scanID uuid.UUID, results []models.ScanResult, message string) error {
+	tx, err := db.Pool.Begin(ctx)
+	if err != nil {
+		return fmt.Errorf("failed to begin transaction: %w", err)
+	}
+	defer tx.Rollback(ctx)
+
+	if err := storeScanResults(ctx, tx, results); err != nil {
+		return err
+	}
+
+	batch := &pgx.Batch{}
+	batch.Queue(updateScanStatusQuery, "completed", 100, nil, scanID)
+	batch.Queue(insertScanLogQuery, uuid.New(), scanID, "success", message, time.Now())
+	if err := tx.SendBatch(ctx, batch).Close(); err != nil {
+		return fmt.Errorf("failed to update scan status: %w", err)
+	}
+
+	return tx.Commit(ctx)
+}
+
+// markScanCancelled records that a scan was stopped, keeping the progress it
+// had reached. It runs with a fresh context since the scan's own context is
+// already cancelled.
+func markScanCancelled(db *database.Database, scanID uuid.UUID, message string) error {
+	ctx := context.Background()
+	batch := &pgx.Batch{}
+	batch.Queue(cancelScanQuery, scanID)
+	batch.Queue(insertScanLogIfExistsQuery, uuid.New(), scanID, "info", message, time.Now())
+	return db.Pool.SendBatch(ctx, batch).Close()
+}
+
+// cancelledMessage is the log message for a scan whose context was cancelled,
+// telling a user cancellation apart from a service shutdown. parent is the
+// context the scan was started with.
+func cancelledMessage(parent context.Context) string {
+	if parent.Err() != nil {
+		return "Scan was cancelled by service shutdown"
+	}
+	return "Scan was cancelled by user"
+}
+
+// failScan marks a scan as failed and logs the reason in one round trip
+func failScan(ctx context.Context, db *database.Database, scanID uuid.UUID, errMsg, message string) error {
+	batch := &pgx.Batch{}
+	batch.Queue(updateScanStatusQuery, "failed", 0, &errMsg, scanID)
+	batch.Queue(insertScanLogQuery, uuid.New(), scanID, "error", message, time.Now())
+	return db.Pool.SendBatch(ctx, batch).Close()
+}